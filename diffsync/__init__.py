@@ -14,9 +14,8 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
-from collections import defaultdict
 from inspect import isclass
-from typing import Callable, ClassVar, Dict, List, Mapping, MutableMapping, Optional, Text, Tuple, Type, Union
+from typing import Callable, ClassVar, Dict, Iterable, Iterator, List, Mapping, Optional, Text, Tuple, Type, Union
 
 from pydantic import BaseModel, PrivateAttr
 import structlog  # type: ignore
@@ -25,6 +24,8 @@ from .diff import Diff
 from .enum import DiffSyncModelFlags, DiffSyncFlags, DiffSyncStatus
 from .exceptions import DiffClassMismatch, ObjectAlreadyExists, ObjectStoreWrongType, ObjectNotFound
 from .helpers import DiffSyncDiffer, DiffSyncSyncer
+from .store import BaseStore
+from .store.local import LocalStore
 
 
 class DiffSyncModel(BaseModel):
@@ -353,6 +354,10 @@ class DiffSyncModel(BaseModel):
         The child object isn't stored, only its unique id.
         The name of the target attribute is defined in `_children` per object type
 
+        If this model belongs to a DiffSync adapter, the change is also written back through its
+        store; with storage engines that hand out deserialized copies (such as RedisStore), an
+        in-place mutation alone would never be persisted.
+
         Raises:
             ObjectStoreWrongType: if the type is not part of `_children`
             ObjectAlreadyExists: if the unique id is already stored
@@ -370,12 +375,17 @@ class DiffSyncModel(BaseModel):
         if child.get_unique_id() in childs:
             raise ObjectAlreadyExists(f"Already storing a {child_type} with unique_id {child.get_unique_id()}", child)
         childs.append(child.get_unique_id())
+        if self.diffsync is not None:
+            self.diffsync.update(self)
 
     def remove_child(self, child: "DiffSyncModel"):
         """Remove a child reference from an object.
 
         The name of the storage attribute is defined in `_children` per object type.
 
+        If this model belongs to a DiffSync adapter, the change is also written back through its
+        store, as with add_child().
+
         Raises:
             ObjectStoreWrongType: if the child model type is not part of `_children`
             ObjectNotFound: if the child wasn't previously present.
@@ -393,6 +403,8 @@ class DiffSyncModel(BaseModel):
         if child.get_unique_id() not in childs:
             raise ObjectNotFound(f"{child} was not found as a child in {attr_name}")
         childs.remove(child.get_unique_id())
+        if self.diffsync is not None:
+            self.diffsync.update(self)
 
 
 class DiffSync:
@@ -408,18 +420,14 @@ class DiffSync:
     top_level: ClassVar[List[str]] = []
     """List of top-level modelnames to begin from when diffing or synchronizing."""
 
-    _data: MutableMapping[str, MutableMapping[str, DiffSyncModel]]
-    """Defaultdict storing model instances.
+    store: BaseStore
+    """Object storage backend for the model instances owned by this DiffSync; a LocalStore by default."""
 
-    `self._data[modelname][unique_id] == model_instance`
-    """
-
-    def __init__(self, name=None):
+    def __init__(self, name=None, internal_storage_engine=LocalStore):
         """Generic initialization function.
 
         Subclasses should be careful to call super().__init__() if they override this method.
         """
-        self._data = defaultdict(dict)
         self._log = structlog.get_logger().new(diffsync=self)
 
         # If the type is not defined, use the name of the class as the default value
@@ -429,6 +437,12 @@ class DiffSync:
         # If the name has not been provided, use the type as the name
         self.name = name if name else self.type
 
+        if isinstance(internal_storage_engine, BaseStore):
+            self.store = internal_storage_engine
+            self.store.diffsync = self
+        else:
+            self.store = internal_storage_engine(diffsync=self, name=self.name)
+
     def __init_subclass__(cls):
         """Validate that references to specific DiffSyncModels use the correct modelnames.
 
@@ -458,8 +472,8 @@ class DiffSync:
         return f"<{str(self)}>"
 
     def __len__(self):
-        """Total number of elements stored in self._data."""
-        return sum(len(entries) for entries in self._data.values())
+        """Total number of elements stored."""
+        return self.store.count()
 
     def load(self):
         """Load all desired data from whatever backend data source into this instance."""
@@ -468,10 +482,10 @@ class DiffSync:
     def dict(self, exclude_defaults: bool = True, **kwargs) -> Mapping:
         """Represent the DiffSync contents as a dict, as if it were a Pydantic model."""
         data: Dict[str, Dict[str, Dict]] = {}
-        for modelname in self._data:
+        for modelname in self.store.get_all_model_names():
             data[modelname] = {}
-            for unique_id, model in self._data[modelname].items():
-                data[modelname][unique_id] = model.dict(exclude_defaults=exclude_defaults, **kwargs)
+            for model in self.store.get_all(modelname):
+                data[modelname][model.get_unique_id()] = model.dict(exclude_defaults=exclude_defaults, **kwargs)
         return data
 
     def str(self, indent: int = 0) -> str:
@@ -628,29 +642,7 @@ class DiffSync:
             ValueError: if obj is a str and identifier is a dict (can't convert dict into a uid str without a model class)
             ObjectNotFound: if the requested object is not present
         """
-        if isinstance(obj, str):
-            modelname = obj
-            if not hasattr(self, obj):
-                object_class = None
-            else:
-                object_class = getattr(self, obj)
-        else:
-            object_class = obj
-            modelname = obj.get_type()
-
-        if isinstance(identifier, str):
-            uid = identifier
-        elif object_class:
-            uid = object_class.create_unique_id(**identifier)
-        else:
-            raise ValueError(
-                f"Invalid args: ({obj}, {identifier}): "
-                f"either {obj} should be a class/instance or {identifier} should be a str"
-            )
-
-        if uid not in self._data[modelname]:
-            raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
-        return self._data[modelname][uid]
+        return self.store.get(obj, identifier)
 
     def get_all(self, obj: Union[Text, DiffSyncModel, Type[DiffSyncModel]]) -> List[DiffSyncModel]:
         """Get all objects of a given type.
@@ -661,12 +653,17 @@ class DiffSync:
         Returns:
             List[DiffSyncModel]: List of Object
         """
-        if isinstance(obj, str):
-            modelname = obj
-        else:
-            modelname = obj.get_type()
+        return self.store.get_all(obj)
+
+    def get_all_iter(self, obj: Union[Text, DiffSyncModel, Type[DiffSyncModel]]) -> Iterator[DiffSyncModel]:
+        """Iterate over all objects of a given type, without materializing them into a list first.
 
-        return list(self._data[modelname].values())
+        Depending on the storage engine, objects may be yielded as they are fetched from the store.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to retrieve
+        """
+        return self.store.get_all_iter(obj)
 
     def get_by_uids(
         self, uids: List[Text], obj: Union[Text, DiffSyncModel, Type[DiffSyncModel]]
@@ -680,17 +677,7 @@ class DiffSync:
         Raises:
             ObjectNotFound: if any of the requested UIDs are not found in the store
         """
-        if isinstance(obj, str):
-            modelname = obj
-        else:
-            modelname = obj.get_type()
-
-        results = []
-        for uid in uids:
-            if uid not in self._data[modelname]:
-                raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
-            results.append(self._data[modelname][uid])
-        return results
+        return self.store.get_by_uids(uids, obj)
 
     def add(self, obj: DiffSyncModel):
         """Add a DiffSyncModel object to the store.
@@ -701,20 +688,33 @@ class DiffSync:
         Raises:
             ObjectAlreadyExists: if a different object with the same uid is already present.
         """
-        modelname = obj.get_type()
-        uid = obj.get_unique_id()
+        self.store.add(obj)
 
-        existing_obj = self._data[modelname].get(uid)
-        if existing_obj:
-            if existing_obj is not obj:
-                raise ObjectAlreadyExists(f"Object {uid} already present", obj)
-            # Return so we don't have to change anything on the existing object and underlying data
-            return
+    def add_many(self, objs: Iterable[DiffSyncModel]):
+        """Add multiple DiffSyncModel objects to the store.
 
-        if not obj.diffsync:
-            obj.diffsync = self
+        Intended for bulk loads in adapter load() implementations; store backends backed by a
+        remote system (such as the RedisStore) batch the resulting writes.
 
-        self._data[modelname][uid] = obj
+        Args:
+            objs: Objects to store
+
+        Raises:
+            ObjectAlreadyExists: if a different object with the same uid as any of the given objects
+                is already present.
+        """
+        self.store.add_many(objs)
+
+    def update(self, obj: DiffSyncModel):
+        """Update a DiffSyncModel object in the store.
+
+        This is only necessary for stores that don't hold objects by reference (such as the RedisStore);
+        with the default LocalStore, in-place modification of a stored object is already persistent.
+
+        Args:
+            obj (DiffSyncModel): Object to update
+        """
+        self.store.update(obj)
 
     def remove(self, obj: DiffSyncModel, remove_children: bool = False):
         """Remove a DiffSyncModel object from the store.
@@ -726,26 +726,7 @@ class DiffSync:
         Raises:
             ObjectNotFound: if the object is not present
         """
-        modelname = obj.get_type()
-        uid = obj.get_unique_id()
-
-        if uid not in self._data[modelname]:
-            raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
-
-        if obj.diffsync is self:
-            obj.diffsync = None
-
-        del self._data[modelname][uid]
-
-        if remove_children:
-            for child_type, child_fieldname in obj.get_children_mapping().items():
-                for child_id in getattr(obj, child_fieldname):
-                    try:
-                        child_obj = self.get(child_type, child_id)
-                        self.remove(child_obj, remove_children=remove_children)
-                    except ObjectNotFound:
-                        # Since this is "cleanup" code, log an error and continue, instead of letting the exception raise
-                        self._log.error(f"Unable to remove child {child_id} of {modelname} {uid} - not found!")
+        self.store.remove(obj, remove_children=remove_children)
 
     def get_or_instantiate(
         self, model: Type[DiffSyncModel], ids: Dict, attrs: Dict = None
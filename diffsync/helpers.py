@@ -372,10 +372,16 @@ class DiffSyncSyncer:  # pylint: disable=too-many-instance-attributes
 
         if self.action == DiffSyncActions.CREATE:  # type: ignore
             if parent_model:
+                # add_child also writes the parent back through the store
                 parent_model.add_child(dst_model)
             self.dst_diffsync.add(dst_model)
+        elif self.action == DiffSyncActions.UPDATE:
+            # Objects retrieved from the store may be copies (e.g. with a Redis-backed store),
+            # so make sure the modified object is written back
+            self.dst_diffsync.update(dst_model)
         elif self.action == DiffSyncActions.DELETE:
             if parent_model:
+                # remove_child also writes the parent back through the store
                 parent_model.remove_child(dst_model)
 
             skip_children = bool(dst_model.model_flags & DiffSyncModelFlags.SKIP_CHILDREN_ON_DELETE)
@@ -0,0 +1,234 @@
+"""BaseStore definition for DiffSync object storage backends.
+
+Copyright (c) 2021 Network To Code, LLC <info@networktocode.com>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Text, Tuple, Type, TYPE_CHECKING, Union
+
+import structlog  # type: ignore
+
+from diffsync.exceptions import ObjectNotFound
+
+if TYPE_CHECKING:  # pragma: no cover
+    # For type annotation purposes only; we have a circular import loop between __init__.py and this file.
+    from diffsync import DiffSync, DiffSyncModel  # pylint: disable=cyclic-import
+
+
+class BaseStore:
+    """Reference class implementing the DiffSync object storage API; subclasses provide actual storage backends."""
+
+    def __init__(self, diffsync: Optional["DiffSync"] = None, name: Optional[str] = None):
+        """Generic initialization function; subclasses should be careful to call super().__init__() if overriding.
+
+        Args:
+            diffsync (DiffSync): DiffSync adapter that owns the objects in this store, if any.
+            name (str): Human readable name of this store, used in log and error messages.
+        """
+        self.diffsync = diffsync
+        self.name = name if name else self.__class__.__name__
+        self._model_class_cache: Optional[Dict[Text, Type["DiffSyncModel"]]] = None
+
+    def __str__(self):
+        """String representation of a BaseStore."""
+        return self.name
+
+    @property
+    def _log(self):
+        """Logging context for this store, bound to the owning DiffSync adapter when one is present.
+
+        Compare against None rather than relying on truthiness - DiffSync defines __len__, so an
+        adapter holding no objects is falsy (and evaluating it costs a store count()).
+        """
+        log = structlog.get_logger().new(store=self)
+        if self.diffsync is not None:
+            log = log.bind(diffsync=self.diffsync)
+        return log
+
+    @property
+    def _model_classes(self) -> Dict[Text, Type["DiffSyncModel"]]:
+        """Registry of the model classes available on the owning DiffSync adapter, keyed by attribute name.
+
+        Covers model classes assigned as class attributes (the usual pattern) as well as instance
+        attributes, matching what a getattr on the adapter would find. Built once on first use, so
+        that resolving a modelname string is a plain dict lookup rather than a hasattr/getattr
+        pair on every get() call; model classes assigned to the adapter after that point won't be
+        picked up.
+        """
+        if self._model_class_cache is None:
+            # None check rather than truthiness: an adapter holding no objects is falsy (__len__)
+            if self.diffsync is None:
+                return {}
+            from diffsync import DiffSyncModel  # pylint: disable=import-outside-toplevel,cyclic-import
+
+            self._model_class_cache = {}
+            for attr_name in dir(self.diffsync):
+                value = getattr(self.diffsync, attr_name, None)
+                if isinstance(value, type) and issubclass(value, DiffSyncModel):
+                    self._model_class_cache[attr_name] = value
+        return self._model_class_cache
+
+    def _get_object_class_and_model(
+        self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]]
+    ) -> Tuple[Optional[Type["DiffSyncModel"]], Text]:
+        """Resolve a model class (if available) and modelname from the given class, instance, or modelname string."""
+        if isinstance(obj, str):
+            modelname = obj
+            object_class = self._model_classes.get(obj)
+        else:
+            object_class = obj if isinstance(obj, type) else obj.__class__
+            modelname = obj.get_type()
+        return object_class, modelname
+
+    def get_all_model_names(self) -> Set[Text]:
+        """Get all the model names stored.
+
+        Returns:
+            Set[Text]: Set of all the model names.
+        """
+        raise NotImplementedError
+
+    def get(
+        self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]], identifier: Union[Text, Mapping]
+    ) -> "DiffSyncModel":
+        """Get one object from the store based on its unique id.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the object to retrieve
+            identifier: Unique ID of the object to retrieve, or dict of unique identifier keys/values
+
+        Raises:
+            ValueError: if obj is a str and identifier is a dict (can't convert dict into a uid str without a model class)
+            ObjectNotFound: if the requested object is not present
+        """
+        raise NotImplementedError
+
+    def get_all(self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]]) -> List["DiffSyncModel"]:
+        """Get all objects of a given type.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to retrieve
+
+        Returns:
+            List[DiffSyncModel]: List of Object
+        """
+        raise NotImplementedError
+
+    def get_all_iter(self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]]) -> Iterator["DiffSyncModel"]:
+        """Iterate over all objects of a given type.
+
+        The default implementation simply iterates over get_all(); backends that fetch from a
+        remote system should override this to stream objects as they arrive, so the caller can
+        start processing before the full set has been materialized.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to retrieve
+        """
+        return iter(self.get_all(obj))
+
+    def get_by_uids(
+        self, uids: List[Text], obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]]
+    ) -> List["DiffSyncModel"]:
+        """Get multiple objects from the store by their unique IDs/Keys and type.
+
+        Args:
+            uids: List of unique id / key identifying object in the database.
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to retrieve
+
+        Raises:
+            ObjectNotFound: if any of the requested UIDs are not found in the store
+        """
+        raise NotImplementedError
+
+    def add(self, obj: "DiffSyncModel"):
+        """Add a DiffSyncModel object to the store.
+
+        Args:
+            obj (DiffSyncModel): Object to store
+
+        Raises:
+            ObjectAlreadyExists: if a different object with the same uid is already present.
+        """
+        raise NotImplementedError
+
+    def add_many(self, objs: Iterable["DiffSyncModel"]):
+        """Add multiple DiffSyncModel objects to the store.
+
+        Backends that talk to a remote system should override this to batch the writes;
+        the default implementation simply adds the objects one at a time.
+
+        Args:
+            objs: Objects to store
+
+        Raises:
+            ObjectAlreadyExists: if a different object with the same uid as any of the given objects
+                is already present.
+        """
+        for obj in objs:
+            self.add(obj)
+
+    def update(self, obj: "DiffSyncModel"):
+        """Update a DiffSyncModel object in the store.
+
+        Args:
+            obj (DiffSyncModel): Object to update
+        """
+        raise NotImplementedError
+
+    def remove_item(self, modelname: Text, uid: Text):
+        """Remove one object from the store based on its model name and unique id.
+
+        Args:
+            modelname: Name of the model of the object to remove
+            uid: Unique ID of the object to remove
+
+        Raises:
+            ObjectNotFound: if the object is not present
+        """
+        raise NotImplementedError
+
+    def count(self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"], None] = None) -> int:
+        """Return the number of objects of the given type in the store, or the total number of objects if obj is None.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to count
+        """
+        raise NotImplementedError
+
+    def remove(self, obj: "DiffSyncModel", remove_children: bool = False):
+        """Remove a DiffSyncModel object from the store.
+
+        Args:
+            obj (DiffSyncModel): object to remove
+            remove_children (bool): If True, also recursively remove any children of this object
+
+        Raises:
+            ObjectNotFound: if the object is not present
+        """
+        modelname = obj.get_type()
+        uid = obj.get_unique_id()
+
+        self.remove_item(modelname, uid)
+
+        if obj.diffsync is self.diffsync:
+            obj.diffsync = None
+
+        if remove_children:
+            for child_type, child_fieldname in obj.get_children_mapping().items():
+                for child_id in getattr(obj, child_fieldname):
+                    try:
+                        child_obj = self.get(child_type, child_id)
+                        self.remove(child_obj, remove_children=remove_children)
+                    except ObjectNotFound:
+                        # Since this is "cleanup" code, log an error and continue, instead of letting the exception raise
+                        self._log.error(f"Unable to remove child {child_id} of {modelname} {uid} - not found!")
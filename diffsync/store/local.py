@@ -0,0 +1,180 @@
+"""LocalStore - in-memory object storage for DiffSync.
+
+Copyright (c) 2021 Network To Code, LLC <info@networktocode.com>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from collections import defaultdict
+from typing import List, Mapping, MutableMapping, Set, Text, Type, TYPE_CHECKING, Union
+
+from diffsync.exceptions import ObjectAlreadyExists, ObjectNotFound
+from diffsync.store import BaseStore
+
+if TYPE_CHECKING:  # pragma: no cover
+    from diffsync import DiffSyncModel  # pylint: disable=cyclic-import
+
+
+class LocalStore(BaseStore):
+    """Local in-memory object store, the default backend for a DiffSync instance."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the LocalStore."""
+        super().__init__(*args, **kwargs)
+
+        self._data: MutableMapping[str, MutableMapping[str, "DiffSyncModel"]] = defaultdict(dict)
+        """Defaultdict storing model instances.
+
+        `self._data[modelname][unique_id] == model_instance`
+        """
+
+    def get_all_model_names(self) -> Set[Text]:
+        """Get all the model names stored.
+
+        Returns:
+            Set[Text]: Set of all the model names.
+        """
+        return set(self._data.keys())
+
+    def get(
+        self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]], identifier: Union[Text, Mapping]
+    ) -> "DiffSyncModel":
+        """Get one object from the store based on its unique id.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the object to retrieve
+            identifier: Unique ID of the object to retrieve, or dict of unique identifier keys/values
+
+        Raises:
+            ValueError: if obj is a str and identifier is a dict (can't convert dict into a uid str without a model class)
+            ObjectNotFound: if the requested object is not present
+        """
+        object_class, modelname = self._get_object_class_and_model(obj)
+
+        if isinstance(identifier, str):
+            uid = identifier
+        elif object_class:
+            uid = object_class.create_unique_id(**identifier)
+        else:
+            raise ValueError(
+                f"Invalid args: ({obj}, {identifier}): "
+                f"either {obj} should be a class/instance or {identifier} should be a str"
+            )
+
+        if uid not in self._data[modelname]:
+            raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
+        return self._data[modelname][uid]
+
+    def get_all(self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]]) -> List["DiffSyncModel"]:
+        """Get all objects of a given type.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to retrieve
+
+        Returns:
+            List[DiffSyncModel]: List of Object
+        """
+        _, modelname = self._get_object_class_and_model(obj)
+
+        return list(self._data[modelname].values())
+
+    def get_by_uids(
+        self, uids: List[Text], obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]]
+    ) -> List["DiffSyncModel"]:
+        """Get multiple objects from the store by their unique IDs/Keys and type.
+
+        Args:
+            uids: List of unique id / key identifying object in the database.
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to retrieve
+
+        Raises:
+            ObjectNotFound: if any of the requested UIDs are not found in the store
+        """
+        _, modelname = self._get_object_class_and_model(obj)
+
+        results = []
+        for uid in uids:
+            if uid not in self._data[modelname]:
+                raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
+            results.append(self._data[modelname][uid])
+        return results
+
+    def add(self, obj: "DiffSyncModel"):
+        """Add a DiffSyncModel object to the store.
+
+        Args:
+            obj (DiffSyncModel): Object to store
+
+        Raises:
+            ObjectAlreadyExists: if a different object with the same uid is already present.
+        """
+        modelname = obj.get_type()
+        uid = obj.get_unique_id()
+
+        existing_obj = self._data[modelname].get(uid)
+        if existing_obj:
+            if existing_obj is not obj:
+                raise ObjectAlreadyExists(f"Object {uid} already present", obj)
+            # Return so we don't have to change anything on the existing object and underlying data
+            return
+
+        if not obj.diffsync:
+            obj.diffsync = self.diffsync
+
+        self._data[modelname][uid] = obj
+
+    def update(self, obj: "DiffSyncModel"):
+        """Update a DiffSyncModel object in the store.
+
+        Since the local store holds objects by reference, in-place modifications are already visible;
+        this only replaces the stored instance if a different instance with the same uid was stored.
+
+        If the object is not present in the store this is a no-op; an update never implicitly
+        (re-)adds an object.
+
+        Args:
+            obj (DiffSyncModel): Object to update
+        """
+        modelname = obj.get_type()
+        uid = obj.get_unique_id()
+
+        if uid not in self._data[modelname]:
+            return
+
+        self._data[modelname][uid] = obj
+
+    def remove_item(self, modelname: Text, uid: Text):
+        """Remove one object from the store based on its model name and unique id.
+
+        Args:
+            modelname: Name of the model of the object to remove
+            uid: Unique ID of the object to remove
+
+        Raises:
+            ObjectNotFound: if the object is not present
+        """
+        if uid not in self._data[modelname]:
+            raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
+
+        del self._data[modelname][uid]
+
+    def count(self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"], None] = None) -> int:
+        """Return the number of objects of the given type in the store, or the total number of objects if obj is None.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to count
+        """
+        if obj is None:
+            return sum(len(entries) for entries in self._data.values())
+
+        _, modelname = self._get_object_class_and_model(obj)
+        return len(self._data[modelname])
@@ -0,0 +1,693 @@
+"""RedisStore - object storage for DiffSync backed by a Redis server.
+
+Copyright (c) 2021 Network To Code, LLC <info@networktocode.com>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import json
+from enum import Enum
+from hashlib import blake2b
+from pickle import HIGHEST_PROTOCOL, dumps, loads  # nosec
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Text, Tuple, Type, TYPE_CHECKING, Union
+from uuid import uuid4
+
+import msgpack
+from redis import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError
+
+try:
+    import lz4.frame  # type: ignore
+except ImportError:
+    lz4 = None  # type: ignore
+
+from diffsync.enum import DiffSyncModelFlags
+from diffsync.exceptions import ObjectAlreadyExists, ObjectNotFound, ObjectStoreException
+from diffsync.store import BaseStore
+
+if TYPE_CHECKING:  # pragma: no cover
+    from diffsync import DiffSyncModel  # pylint: disable=cyclic-import
+
+REDIS_DIFFSYNC_BASE_LABEL = "diffsync"
+
+HMGET_CHUNK_SIZE = 1000
+"""Maximum number of fields to request in a single HMGET command.
+
+Chunking bounds the size of any individual Redis command when fetching very large batches of objects.
+"""
+
+SCAN_COUNT_HINT = 1000
+"""COUNT hint passed to SCAN-family commands, so that each SCAN round-trip returns a useful batch of entries."""
+
+FORMAT_PICKLE = b"\x00"
+FORMAT_MSGPACK = b"\x01"
+FORMAT_LZ4 = b"\x02"
+"""Single-byte prefixes identifying the serialization format of a stored blob."""
+
+COMPRESSION_MIN_SIZE = 8192
+"""Blobs larger than this many bytes are lz4-compressed before writing, if lz4 is installed.
+
+Below this size the compression overhead outweighs the bandwidth and memory savings.
+"""
+
+
+LUA_DELETE_TREE = """
+local prefix = ARGV[1]
+local mapping = cjson.decode(ARGV[2])
+local stack = {{ARGV[3], ARGV[4]}}
+local seen = {}
+local deleted = {}
+local missing = {}
+-- Phase 1: walk and validate the whole subtree without writing anything, so an unparseable
+-- blob aborts the script before any deletion has happened. The seen table keeps cyclic child
+-- references from looping forever, since nothing is deleted during the walk.
+while #stack > 0 do
+    local item = table.remove(stack)
+    local modelname = item[1]
+    local uid = item[2]
+    if not seen[modelname .. ":" .. uid] then
+        seen[modelname .. ":" .. uid] = true
+        local blob = redis.call("HGET", prefix .. ":" .. modelname, uid)
+        if not blob then
+            if item[3] then
+                missing[#missing + 1] = {uid, item[3], item[4]}
+            end
+        else
+            local children = mapping[modelname]
+            if children and next(children) ~= nil then
+                if string.byte(blob, 1) ~= 1 then
+                    return redis.error_reply("blob format not supported by server-side delete")
+                end
+                local data = cmsgpack.unpack(string.sub(blob, 2))
+                for child_type, fieldname in pairs(children) do
+                    local child_ids = data[fieldname]
+                    if child_ids then
+                        for i = 1, #child_ids do
+                            stack[#stack + 1] = {child_type, child_ids[i], modelname, uid}
+                        end
+                    end
+                end
+            end
+            deleted[#deleted + 1] = {modelname, uid}
+        end
+    end
+end
+-- Phase 2: every blob checked out, delete the subtree
+for i = 1, #deleted do
+    redis.call("HDEL", prefix .. ":" .. deleted[i][1], deleted[i][2])
+end
+return {deleted, missing}
+"""
+"""Lua script deleting a whole subtree of objects server-side, in a single round-trip.
+
+Walks the msgpack blobs with cmsgpack to find child uids, and reports back which objects it
+deleted and which children were referenced but not found. The walk is two-phase - validate and
+collect everything first, delete second - so that when the script aborts on a blob it can't parse
+(a pickled or lz4-compressed one), it has written nothing and the client can safely fall back to
+the pipelined walk.
+"""
+
+
+def _msgpack_default(value):
+    """Teach msgpack how to pack the non-primitive field types used by DiffSyncModel, such as enum flags."""
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value)} to msgpack")
+
+
+class RedisStore(BaseStore):
+    """Object store backed by a Redis server, suitable for sharing data across processes."""
+
+    def __init__(
+        self,
+        *args,
+        store_id: Optional[str] = None,
+        url: Optional[str] = None,
+        host: Optional[str] = None,
+        port: int = 6379,
+        db: int = 0,  # pylint: disable=invalid-name
+        **kwargs,
+    ):  # pylint: disable=too-many-arguments
+        """Initialize the RedisStore and validate the connection to the Redis server.
+
+        Args:
+            store_id (str): Label to distinguish the keys of this store from other stores in the same Redis
+                database; randomly generated if not provided.
+            url (str): Redis server connection URL, e.g. "redis://localhost:6379/0"
+            host (str): Redis server host, as an alternative to providing a url
+            port (int): Redis server port, used together with host
+            db (int): Redis database number
+
+        Raises:
+            ObjectStoreException: if the connection to the Redis server can't be established
+        """
+        super().__init__(*args, **kwargs)
+
+        try:
+            if url:
+                self._store = Redis.from_url(url, db=db)
+            elif host:
+                self._store = Redis(host=host, port=port, db=db)
+            else:
+                raise ObjectStoreException("Neither url nor host was provided to connect to the Redis store.")
+
+            if not self._store.ping():
+                raise RedisConnectionError()
+        except RedisConnectionError:
+            raise ObjectStoreException("Redis store is unavailable.") from None
+
+        self._store_id = store_id if store_id else str(uuid4())[:8]
+        self._store_label = f"{REDIS_DIFFSYNC_BASE_LABEL}:{self._store_id}"
+
+        # Client-side fingerprints of the blobs this store has already written, keyed by
+        # (modelname, uid). Lets add/update skip the network entirely when re-writing unchanged
+        # data, which is the common case when re-running an idempotent sync.
+        self._digest_cache: Dict[Tuple[Text, Text], bytes] = {}
+
+        # Pre-encoded per-model HASH keys, so hot paths don't re-format and re-encode them
+        self._model_hash_key: Dict[Text, bytes] = {}
+
+        # Registering the script is purely client-side; it is only sent to the server when called
+        self._delete_tree_script = self._store.register_script(LUA_DELETE_TREE)
+
+    def __str__(self):
+        """String representation of a RedisStore."""
+        return f"{self.name} ({self._store_id})"
+
+    @staticmethod
+    def _digest(blob: bytes) -> bytes:
+        """Compute a compact fingerprint of a serialized blob, for the write-deduplication cache."""
+        return blake2b(blob, digest_size=16).digest()
+
+    def _get_hash_key(self, modelname: Text) -> bytes:
+        """Build (and cache) the Redis key of the HASH holding all stored objects of the given model.
+
+        Each object is a field of its model's HASH, keyed by uid, so per-object access never needs
+        to format a key and model-wide operations (HLEN, HSCAN) are local to one Redis key.
+        """
+        hash_key = self._model_hash_key.get(modelname)
+        if hash_key is None:
+            hash_key = f"{self._store_label}:{modelname}".encode()
+            self._model_hash_key[modelname] = hash_key
+        return hash_key
+
+    @staticmethod
+    def _export(obj: "DiffSyncModel") -> dict:
+        """Export the field values of a model for serialization, without the pure-Python recursion of .dict().
+
+        pydantic keeps the validated field values directly in __dict__, so a shallow copy (minus
+        the non-serializable diffsync reference) is all msgpack needs; for the flat models diffsync
+        works with this is equivalent to obj.dict() at a fraction of the cost.
+        """
+        data = dict(obj.__dict__)
+        data.pop("diffsync", None)
+        return data
+
+    def _dumps(self, obj: "DiffSyncModel") -> bytes:
+        """Serialize a DiffSyncModel for storage in Redis.
+
+        Models whose class is registered on the owning DiffSync adapter are stored as msgpack of
+        their dict representation, which is both faster and smaller on the wire than pickle.
+        Models of unknown classes (or with field types msgpack can't represent) fall back to
+        pickle, as the dict alone wouldn't be enough to rebuild them on read.
+        """
+        modelname = obj.get_type()
+        blob = None
+        # Gate on the same registry the read paths use to resolve the class, so an object can
+        # only be written as msgpack if it is guaranteed to be readable back
+        if self._model_classes.get(modelname) is obj.__class__:
+            try:
+                blob = FORMAT_MSGPACK + msgpack.packb(self._export(obj), use_bin_type=True, default=_msgpack_default)
+            except (TypeError, ValueError):
+                pass
+
+        if blob is None:
+            # The DiffSync adapter (and its logger, etc.) is not serializable, so null it out while
+            # pickling rather than paying for a full model copy on every write
+            saved_diffsync = obj.diffsync
+            obj.diffsync = None
+            try:
+                payload = dumps(obj, protocol=HIGHEST_PROTOCOL)
+            finally:
+                obj.diffsync = saved_diffsync
+            blob = FORMAT_PICKLE + payload
+
+        if lz4 is not None and len(blob) > COMPRESSION_MIN_SIZE:
+            blob = FORMAT_LZ4 + lz4.frame.compress(blob)
+        return blob
+
+    @staticmethod
+    def _maybe_decompress(blob: bytes) -> bytes:
+        """Undo the lz4 compression applied by _dumps to large blobs, if any."""
+        if blob[:1] != FORMAT_LZ4:
+            return blob
+        if lz4 is None:
+            raise ObjectStoreException("Stored blob is lz4-compressed, but the lz4 package is not installed.")
+        return lz4.frame.decompress(memoryview(blob)[1:])
+
+    def _loads(self, blob: bytes, modelname: Text) -> "DiffSyncModel":
+        """Deserialize a DiffSyncModel previously stored in Redis, and re-attach it to our DiffSync adapter."""
+        blob = self._maybe_decompress(blob)
+        # Slice the payload through a memoryview so large blobs aren't copied just to skip the format byte
+        fmt, payload = blob[:1], memoryview(blob)[1:]
+        if fmt == FORMAT_MSGPACK:
+            data = msgpack.unpackb(payload, raw=False)
+            # model_flags is packed as its int value (see _msgpack_default); restore the enum
+            if "model_flags" in data:
+                data["model_flags"] = DiffSyncModelFlags(data["model_flags"])
+            # The data was validated when the stored instance was first built, so construct()
+            # can skip pydantic's validation traversal, which dominates the cost of a read
+            obj = self._model_classes[modelname].construct(**data)
+        else:
+            obj = loads(payload)  # nosec
+        obj.diffsync = self.diffsync
+        return obj
+
+    def get_all_model_names(self) -> Set[Text]:
+        """Get all the model names stored.
+
+        Returns:
+            Set[Text]: Set of all the model names.
+        """
+        # One HASH exists per stored model, so the keyspace under our label is tiny and cheap to SCAN
+        return {key.decode().split(":")[2] for key in self._store.scan_iter(f"{self._store_label}:*")}
+
+    def get(
+        self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]], identifier: Union[Text, Mapping]
+    ) -> "DiffSyncModel":
+        """Get one object from the store based on its unique id.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the object to retrieve
+            identifier: Unique ID of the object to retrieve, or dict of unique identifier keys/values
+
+        Raises:
+            ValueError: if obj is a str and identifier is a dict (can't convert dict into a uid str without a model class)
+            ObjectNotFound: if the requested object is not present
+        """
+        object_class, modelname = self._get_object_class_and_model(obj)
+
+        if isinstance(identifier, str):
+            uid = identifier
+        elif object_class:
+            uid = object_class.create_unique_id(**identifier)
+        else:
+            raise ValueError(
+                f"Invalid args: ({obj}, {identifier}): "
+                f"either {obj} should be a class/instance or {identifier} should be a str"
+            )
+
+        blob = self._store.hget(self._get_hash_key(modelname), uid)
+        if blob is None:
+            raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
+        return self._loads(blob, modelname)
+
+    def get_all_iter(self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]]) -> Iterator["DiffSyncModel"]:
+        """Iterate over all objects of a given type, fetching them from Redis in chunks.
+
+        Objects are yielded as each HSCAN batch of the model's HASH returns, so the caller can
+        start processing after one round-trip and peak memory stays bounded by the batch size
+        rather than the model size.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to retrieve
+        """
+        _, modelname = self._get_object_class_and_model(obj)
+
+        # HSCAN returns fields and values together, so each batch of objects arrives in a single
+        # round-trip without a separate fetch for the uids
+        for _, blob in self._store.hscan_iter(self._get_hash_key(modelname), count=SCAN_COUNT_HINT):
+            yield self._loads(blob, modelname)
+
+    def get_all(self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]]) -> List["DiffSyncModel"]:
+        """Get all objects of a given type.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to retrieve
+
+        Returns:
+            List[DiffSyncModel]: List of Object
+        """
+        return list(self.get_all_iter(obj))
+
+    def get_by_uids(
+        self, uids: List[Text], obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"]]
+    ) -> List["DiffSyncModel"]:
+        """Get multiple objects from the store by their unique IDs/Keys and type.
+
+        The objects are fetched in bulk with HMGET (one round-trip per HMGET_CHUNK_SIZE uids)
+        rather than one HGET per object.
+
+        Args:
+            uids: List of unique id / key identifying object in the database.
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to retrieve
+
+        Raises:
+            ObjectNotFound: if any of the requested UIDs are not found in the store
+        """
+        _, modelname = self._get_object_class_and_model(obj)
+
+        hash_key = self._get_hash_key(modelname)
+        results = []
+        for start in range(0, len(uids), HMGET_CHUNK_SIZE):
+            chunk = uids[start : start + HMGET_CHUNK_SIZE]
+            # HMGET responses are positional, so the ordering of the requested uids is preserved
+            for uid, blob in zip(chunk, self._store.hmget(hash_key, chunk)):
+                if blob is None:
+                    raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
+                results.append(self._loads(blob, modelname))
+        return results
+
+    def add(self, obj: "DiffSyncModel"):
+        """Add a DiffSyncModel object to the store.
+
+        Args:
+            obj (DiffSyncModel): Object to store
+
+        Raises:
+            ObjectAlreadyExists: if a different object with the same uid is already present.
+        """
+        modelname = obj.get_type()
+        uid = obj.get_unique_id()
+
+        if obj.diffsync is None:
+            obj.diffsync = self.diffsync
+
+        blob = self._dumps(obj)
+        digest = self._digest(blob)
+
+        # Fast path: this exact serialized form is already in the store, nothing to do
+        if self._digest_cache.get((modelname, uid)) == digest:
+            return
+
+        hash_key = self._get_hash_key(modelname)
+        existing_blob = self._store.hget(hash_key, uid)
+        if existing_blob is not None:
+            existing_obj = self._loads(existing_blob, modelname)
+            if existing_obj.dict() != obj.dict():
+                raise ObjectAlreadyExists(f"Object {uid} already present", obj)
+            # Return so we don't have to change anything on the existing object and underlying data
+            self._digest_cache[(modelname, uid)] = digest
+            return
+
+        self._store.hset(hash_key, uid, blob)
+        self._digest_cache[(modelname, uid)] = digest
+
+    def add_many(self, objs: Iterable["DiffSyncModel"]):
+        """Add multiple DiffSyncModel objects to the store.
+
+        All writes for a batch are buffered into a single pipeline, so a bulk load costs one
+        duplicate-check HMGET per model plus one pipelined HSET burst per batch, instead of two
+        round-trips per object.
+
+        Args:
+            objs: Objects to store
+
+        Raises:
+            ObjectAlreadyExists: if a different object with the same uid as any of the given objects
+                is already present (in the store or earlier in the batch).
+        """
+        objs = list(objs)
+        for start in range(0, len(objs), HMGET_CHUNK_SIZE):
+            batch = objs[start : start + HMGET_CHUNK_SIZE]
+
+            # Serialize up front, group by model, and drop objects whose exact blob was already
+            # written, so they cost neither the duplicate-check HMGET nor a redundant HSET
+            fresh: Dict[Text, List[Tuple["DiffSyncModel", Text, bytes, bytes]]] = {}
+            for obj in batch:
+                modelname = obj.get_type()
+                uid = obj.get_unique_id()
+                if obj.diffsync is None:
+                    obj.diffsync = self.diffsync
+                blob = self._dumps(obj)
+                digest = self._digest(blob)
+                if self._digest_cache.get((modelname, uid)) == digest:
+                    continue
+                fresh.setdefault(modelname, []).append((obj, uid, blob, digest))
+            if not fresh:
+                continue
+
+            pipe = self._store.pipeline(transaction=False)
+            pending: dict = {}
+            written: Dict[Tuple[Text, Text], bytes] = {}
+            for modelname, entries in fresh.items():
+                hash_key = self._get_hash_key(modelname)
+                mapping: Dict[Text, bytes] = {}
+                existing_blobs = self._store.hmget(hash_key, [uid for _, uid, _, _ in entries])
+                for (obj, uid, blob, digest), existing_blob in zip(entries, existing_blobs):
+                    if existing_blob is not None:
+                        existing_obj = self._loads(existing_blob, modelname)
+                        if existing_obj.dict() != obj.dict():
+                            raise ObjectAlreadyExists(f"Object {uid} already present", obj)
+                        # Already stored with identical data; nothing to write
+                        self._digest_cache[(modelname, uid)] = digest
+                        continue
+                    if (modelname, uid) in pending:
+                        if pending[(modelname, uid)].dict() != obj.dict():
+                            raise ObjectAlreadyExists(f"Object {uid} already present", obj)
+                        continue
+                    pending[(modelname, uid)] = obj
+                    mapping[uid] = blob
+                    written[(modelname, uid)] = digest
+                if mapping:
+                    pipe.hset(hash_key, mapping=mapping)
+            pipe.execute()
+            self._digest_cache.update(written)
+
+    def update(self, obj: "DiffSyncModel"):
+        """Update a DiffSyncModel object in the store.
+
+        Unlike the local store, objects retrieved from Redis are deserialized copies, so any
+        modification needs to be written back explicitly.
+
+        If the object is not present in its model's HASH (checked with HEXISTS) this is a no-op;
+        an update never implicitly (re-)adds an object.
+
+        Args:
+            obj (DiffSyncModel): Object to update
+        """
+        modelname = obj.get_type()
+        uid = obj.get_unique_id()
+        blob = self._dumps(obj)
+        digest = self._digest(blob)
+
+        # Fast path: the store already holds this exact serialized form, nothing to write
+        if self._digest_cache.get((modelname, uid)) == digest:
+            return
+
+        # HSET has no "only if exists" option, so check presence explicitly to preserve the
+        # update-never-re-adds semantics
+        hash_key = self._get_hash_key(modelname)
+        if self._store.hexists(hash_key, uid):
+            self._store.hset(hash_key, uid, blob)
+            self._digest_cache[(modelname, uid)] = digest
+
+    def remove_item(self, modelname: Text, uid: Text):
+        """Remove one object from the store based on its model name and unique id.
+
+        Args:
+            modelname: Name of the model of the object to remove
+            uid: Unique ID of the object to remove
+
+        Raises:
+            ObjectNotFound: if the object is not present
+        """
+        removed = self._store.hdel(self._get_hash_key(modelname), uid)
+        self._digest_cache.pop((modelname, uid), None)
+
+        # The HDEL reply is the number of fields actually removed, so a separate pre-flight
+        # HEXISTS round-trip isn't needed to detect a missing object
+        if not removed:
+            raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
+
+    def _children_from_blob(self, blob: bytes, modelname: Text) -> List[Tuple[Text, List[Text]]]:
+        """Extract the (child modelname, child uids) lists of a stored object without fully deserializing it.
+
+        During a cascading delete the only thing needed from each child is the uids of its own
+        children, so for msgpack blobs those lists are read straight out of the unpacked dict,
+        skipping pydantic model construction entirely. Pickle blobs still require a full load.
+        """
+        blob = self._maybe_decompress(blob)
+        if blob[:1] == FORMAT_MSGPACK:
+            object_class = self._model_classes[modelname]
+            data = msgpack.unpackb(memoryview(blob)[1:], raw=False)
+            return [
+                (child_type, list(data.get(child_fieldname) or []))
+                for child_type, child_fieldname in object_class.get_children_mapping().items()
+            ]
+        obj = loads(memoryview(blob)[1:])  # nosec
+        return [
+            (child_type, list(getattr(obj, child_fieldname)))
+            for child_type, child_fieldname in obj.get_children_mapping().items()
+        ]
+
+    def _collect_delete_items(
+        self,
+        modelname: Text,
+        uid: Text,
+        children: List[Tuple[Text, List[Text]]],
+        acc: List[Tuple[Text, Text]],
+        seen: Set[Tuple[Text, Text]],
+    ):  # pylint: disable=too-many-arguments
+        """Recursively collect the (modelname, uid) of all the given children into acc.
+
+        Children of each type are fetched in bulk with HMGET so the tree walk costs one round-trip
+        per (object, child type) rather than one per child, and only the child uid lists (not full
+        model instances) are decoded from the fetched blobs. Since nothing is deleted until the
+        whole subtree has been collected, the seen set is what keeps cyclic child references from
+        recursing forever (and spares diamond-shaped graphs a duplicate fetch and delete).
+        """
+        for child_type, child_ids in children:
+            hash_key = self._get_hash_key(child_type)
+            new_ids = []
+            for child_id in child_ids:
+                if (child_type, child_id) not in seen:
+                    seen.add((child_type, child_id))
+                    new_ids.append(child_id)
+            for start in range(0, len(new_ids), HMGET_CHUNK_SIZE):
+                chunk = new_ids[start : start + HMGET_CHUNK_SIZE]
+                for child_id, blob in zip(chunk, self._store.hmget(hash_key, chunk)):
+                    if blob is None:
+                        # Since this is "cleanup" code, log an error and continue, instead of raising an exception
+                        self._log.error(f"Unable to remove child {child_id} of {modelname} {uid} - not found!")
+                        continue
+                    acc.append((child_type, child_id))
+                    self._collect_delete_items(
+                        child_type, child_id, self._children_from_blob(blob, child_type), acc, seen
+                    )
+
+    def _children_class_mapping(self, object_class: Type["DiffSyncModel"]) -> Optional[Dict[Text, Dict[Text, Text]]]:
+        """Build the modelname -> children mapping for every model class reachable from the given one.
+
+        Returns None if any reachable child class is not registered on the adapter, in which case
+        the caller can't know the full shape of the subtree without deserializing objects.
+        """
+        mapping: Dict[Text, Dict[Text, Text]] = {}
+        stack = [object_class]
+        while stack:
+            model_class = stack.pop()
+            modelname = model_class.get_type()
+            if modelname in mapping:
+                continue
+            children = dict(model_class.get_children_mapping())
+            mapping[modelname] = children
+            for child_type in children:
+                child_class = self._model_classes.get(child_type)
+                if child_class is None:
+                    return None
+                stack.append(child_class)
+        return mapping
+
+    def _remove_tree_server_side(self, obj: "DiffSyncModel", modelname: Text, uid: Text) -> bool:
+        """Try to delete the given object and its whole subtree of children with one EVAL round-trip.
+
+        Returns False if the server-side path can't be used - scripting unavailable (e.g. Redis
+        cluster), unregistered model classes in the tree, or blobs the script can't parse - so the
+        caller can fall back to the client-side pipeline walk. The script validates the whole
+        subtree before deleting anything, so a False return means the store is untouched.
+        """
+        mapping = self._children_class_mapping(obj.__class__)
+        if mapping is None:
+            return False
+
+        try:
+            deleted, missing = self._delete_tree_script(
+                keys=[], args=[self._store_label, json.dumps(mapping), modelname, uid]
+            )
+        except RedisError:
+            return False
+
+        for entry in missing:
+            child_id, parent_model, parent_uid = (value.decode() for value in entry)
+            # Since this is "cleanup" code, log an error and continue, instead of raising an exception
+            self._log.error(f"Unable to remove child {child_id} of {parent_model} {parent_uid} - not found!")
+
+        deleted_items = [tuple(value.decode() for value in entry) for entry in deleted]
+        for item in deleted_items:
+            self._digest_cache.pop(item, None)
+
+        if (modelname, uid) not in deleted_items:
+            raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
+
+        if obj.diffsync is self.diffsync:
+            obj.diffsync = None
+        return True
+
+    def remove(self, obj: "DiffSyncModel", remove_children: bool = False):
+        """Remove a DiffSyncModel object from the store.
+
+        Recursive removals are pushed server-side as a single Lua script when possible, so the
+        whole subtree walk costs one round-trip; otherwise the object itself is deleted first
+        (so a missing object raises without disturbing its children) and the whole subtree of
+        children is then buffered into a single pipeline.
+
+        Args:
+            obj (DiffSyncModel): object to remove
+            remove_children (bool): If True, also recursively remove any children of this object
+
+        Raises:
+            ObjectNotFound: if the object is not present
+        """
+        modelname = obj.get_type()
+        uid = obj.get_unique_id()
+
+        if remove_children and self._remove_tree_server_side(obj, modelname, uid):
+            return
+
+        # Delete the object itself first, on its own: the HDEL reply doubles as the existence
+        # check, so a missing object raises before any of its children have been touched
+        if not self._store.hdel(self._get_hash_key(modelname), uid):
+            raise ObjectNotFound(f"{modelname} {uid} not present in {self.name}")
+        self._digest_cache.pop((modelname, uid), None)
+
+        if remove_children:
+            children = [
+                (child_type, list(getattr(obj, child_fieldname)))
+                for child_type, child_fieldname in obj.get_children_mapping().items()
+            ]
+            items: List[Tuple[Text, Text]] = []
+            self._collect_delete_items(modelname, uid, children, items, seen={(modelname, uid)})
+
+            # Group the subtree by model so the whole removal is one HDEL per model, all buffered
+            # into a single pipeline
+            by_model: Dict[Text, List[Text]] = {}
+            for item_modelname, item_uid in items:
+                by_model.setdefault(item_modelname, []).append(item_uid)
+            if by_model:
+                pipe = self._store.pipeline(transaction=False)
+                for item_modelname, item_uids in by_model.items():
+                    pipe.hdel(self._get_hash_key(item_modelname), *item_uids)
+                pipe.execute()
+            for item in items:
+                self._digest_cache.pop(item, None)
+
+        if obj.diffsync is self.diffsync:
+            obj.diffsync = None
+
+    def count(self, obj: Union[Text, "DiffSyncModel", Type["DiffSyncModel"], None] = None) -> int:
+        """Return the number of objects of the given type in the store, or the total number of objects if obj is None.
+
+        Args:
+            obj: DiffSyncModel class or instance, or modelname string, that defines the type of the objects to count
+        """
+        if obj is not None:
+            _, modelname = self._get_object_class_and_model(obj)
+            # HLEN answers in O(1) server-side, instead of transferring every matching key
+            return self._store.hlen(self._get_hash_key(modelname))
+
+        hash_keys = list(self._store.scan_iter(f"{self._store_label}:*"))
+        if not hash_keys:
+            return 0
+        pipe = self._store.pipeline(transaction=False)
+        for hash_key in hash_keys:
+            pipe.hlen(hash_key)
+        return sum(pipe.execute())
@@ -33,7 +33,7 @@ def test_diffsync_default_name_type(generic_diffsync):
 
 def test_diffsync_generic_load_is_noop(generic_diffsync):
     generic_diffsync.load()
-    assert len(generic_diffsync._data) == 0  # pylint: disable=protected-access
+    assert len(generic_diffsync.store._data) == 0  # pylint: disable=protected-access
 
 
 def test_diffsync_dict_with_no_data(generic_diffsync):
@@ -90,13 +90,13 @@ def test_diffsync_add_no_raises_existing_same_object(generic_diffsync):
 
     # First attempt at adding object
     generic_diffsync.add(person)
-    assert modelname in generic_diffsync._data  # pylint: disable=protected-access
-    assert uid in generic_diffsync._data[modelname]  # pylint: disable=protected-access
-    assert person == generic_diffsync._data[modelname][uid]  # pylint: disable=protected-access
+    assert modelname in generic_diffsync.store._data  # pylint: disable=protected-access
+    assert uid in generic_diffsync.store._data[modelname]  # pylint: disable=protected-access
+    assert person == generic_diffsync.store._data[modelname][uid]  # pylint: disable=protected-access
 
     # Attempt to add again and make sure it doesn't raise an exception
     generic_diffsync.add(person)
-    assert person is generic_diffsync._data[modelname][uid]  # pylint: disable=protected-access
+    assert person is generic_diffsync.store._data[modelname][uid]  # pylint: disable=protected-access
     assert person is generic_diffsync.get(PersonA, "Mikhail Yohman")
 
 
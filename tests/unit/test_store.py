@@ -0,0 +1,383 @@
+"""Unit tests for the BaseStore subclasses (LocalStore and RedisStore).
+
+Copyright (c) 2021 Network To Code, LLC <info@networktocode.com>
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import os
+from typing import List
+
+import fakeredis
+import lz4.frame
+import pytest
+from redis import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from diffsync import DiffSync, DiffSyncModel
+from diffsync.exceptions import ObjectAlreadyExists, ObjectNotFound
+from diffsync.store import BaseStore
+from diffsync.store.local import LocalStore
+from diffsync.store import redis as redis_module
+from diffsync.store.redis import COMPRESSION_MIN_SIZE, RedisStore
+
+from .conftest import Site, Device, BackendA, BackendB, PlaceB
+
+
+@pytest.fixture(autouse=True)
+def fake_redis_server(monkeypatch):
+    """Replace the Redis client class with an in-memory fake for all tests in this module.
+
+    Note that fakeredis clients with the same connection parameters share a single in-memory
+    server, just like real Redis clients would, so the fake server is flushed between tests.
+    """
+    monkeypatch.setattr(redis_module, "Redis", fakeredis.FakeRedis)
+    yield
+    fakeredis.FakeRedis(host="localhost").flushall()
+
+
+@pytest.fixture(params=["local", "redis"])
+def store(request):
+    """Provide an instance of each of the available store backends."""
+    if request.param == "local":
+        return LocalStore(name="mystore")
+    return RedisStore(name="mystore", store_id="mystoreid", host="localhost")
+
+
+def test_base_store_is_abstract():
+    base_store = BaseStore(name="mystore")
+    assert str(base_store) == "mystore"
+    for method in (base_store.get_all_model_names, base_store.count):
+        with pytest.raises(NotImplementedError):
+            method()
+
+
+def test_store_with_no_data(store):
+    assert store.get_all_model_names() == set()
+    assert store.count() == 0
+    assert not store.get_all(Site)
+    assert not store.get_by_uids([], Site)
+    with pytest.raises(ObjectNotFound):
+        store.get(Site, "nyc")
+    with pytest.raises(ObjectNotFound):
+        store.get_by_uids(["nyc"], "site")
+    with pytest.raises(ObjectNotFound):
+        store.remove_item("site", "nyc")
+
+
+def test_store_add_get_remove(store):
+    site = Site(name="nyc")
+    store.add(site)
+
+    assert store.get_all_model_names() == {"site"}
+    assert store.count() == 1
+    assert store.count(Site) == 1
+    assert store.count("device") == 0
+
+    retrieved = store.get(Site, "nyc")
+    assert retrieved.name == "nyc"
+    assert store.get("site", "nyc").name == "nyc"
+    assert store.get(Site, {"name": "nyc"}).name == "nyc"
+
+    store.remove(site)
+    assert store.count() == 0
+    with pytest.raises(ObjectNotFound):
+        store.get(Site, "nyc")
+
+
+def test_store_get_invalid_args(store):
+    with pytest.raises(ValueError):
+        store.get("anything", {"name": "nyc"})
+
+
+def test_store_add_raises_existing_object_with_different_data(store):
+    store.add(Device(name="device1", role="spine"))
+    with pytest.raises(ObjectAlreadyExists) as error:
+        store.add(Device(name="device1", role="leaf"))
+    assert error.value.existing_object.get_unique_id() == "device1"
+
+
+def test_store_add_many(store):
+    store.add(Site(name="nyc"))
+    store.add_many([Site(name="sfo"), Site(name="rdu"), Device(name="device1", role="spine")])
+
+    assert store.count("site") == 3
+    assert store.count("device") == 1
+
+    with pytest.raises(ObjectAlreadyExists):
+        store.add_many([Site(name="atl"), Device(name="device1", role="leaf")])
+
+
+def test_store_get_all_and_get_by_uids(store):
+    for name in ("nyc", "sfo", "rdu"):
+        store.add(Site(name=name))
+
+    assert sorted(site.name for site in store.get_all(Site)) == ["nyc", "rdu", "sfo"]
+    assert sorted(site.name for site in store.get_all("site")) == ["nyc", "rdu", "sfo"]
+
+    # get_by_uids must preserve the requested ordering
+    results = store.get_by_uids(["sfo", "nyc"], Site)
+    assert [site.name for site in results] == ["sfo", "nyc"]
+
+    with pytest.raises(ObjectNotFound):
+        store.get_by_uids(["nyc", "lax"], Site)
+
+
+def test_store_get_all_iter(store):
+    for name in ("nyc", "sfo"):
+        store.add(Site(name=name))
+
+    iterator = store.get_all_iter(Site)
+    assert not isinstance(iterator, list)
+    assert sorted(site.name for site in iterator) == ["nyc", "sfo"]
+
+
+def test_store_remove_with_children(store):
+    site = Site(name="nyc", devices=["device1", "device2"])
+    store.add(site)
+    store.add(Device(name="device1", role="spine"))
+    store.add(Device(name="device2", role="leaf"))
+
+    store.remove(site, remove_children=True)
+    assert store.count() == 0
+
+
+def test_store_remove_with_children_missing_root_is_non_destructive(store):
+    site = Site(name="nyc", devices=["device1"])
+    store.add(Device(name="device1", role="spine"))
+
+    # The site itself was never added, so removal must fail before touching its children
+    with pytest.raises(ObjectNotFound):
+        store.remove(site, remove_children=True)
+    assert store.count("device") == 1
+
+
+def test_store_remove_with_missing_children_logs_and_continues(store, log):
+    site = Site(name="nyc", devices=["device1"])
+    store.add(site)
+
+    store.remove(site, remove_children=True)
+    assert store.count() == 0
+    assert log.has("Unable to remove child device1 of site nyc - not found!")
+
+
+def test_redis_store_key_layout():
+    store = RedisStore(store_id="keylayout", host="localhost")
+    store.add(Site(name="nyc"))
+    keys = [key.decode() for key in store._store.scan_iter("diffsync:keylayout:*")]  # pylint: disable=protected-access
+    # One HASH per model, with one field per object
+    assert keys == ["diffsync:keylayout:site"]
+    assert store._store.hkeys("diffsync:keylayout:site") == [b"nyc"]  # pylint: disable=protected-access
+
+
+def test_redis_store_delete_tree_script_unavailable_on_fakeredis():
+    store = RedisStore(store_id="nolua", host="localhost")
+    backend = BackendA(internal_storage_engine=store)
+    backend.load()
+    site = backend.get("site", "nyc")
+
+    # fakeredis's Lua runtime lacks cmsgpack, so within this module the server-side delete path is
+    # never actually taken; every other remove_children test here exercises the client fallback.
+    # See test_redis_store_delete_tree_script_on_real_redis for coverage of the script itself.
+    mapping = store._children_class_mapping(type(site))  # pylint: disable=protected-access
+    with pytest.raises(RedisError, match="cmsgpack"):
+        store._delete_tree_script(  # pylint: disable=protected-access
+            keys=[], args=["diffsync:nolua", json.dumps(mapping), "site", "nyc"]
+        )
+    assert store._remove_tree_server_side(site, "site", "nyc") is False  # pylint: disable=protected-access
+
+    # The aborted script deleted nothing, and the fallback removes the full tree
+    assert store.count("site") == 3
+    backend.remove(site, remove_children=True)
+    assert store.count("site") == 2
+    assert store.count("device") == 4
+    assert store.count("interface") == 9
+
+
+@pytest.mark.skipif(
+    "DIFFSYNC_TEST_REDIS_URL" not in os.environ,
+    reason="Requires a real Redis server; set DIFFSYNC_TEST_REDIS_URL (e.g. redis://localhost:6379/0)",
+)
+def test_redis_store_delete_tree_script_on_real_redis(monkeypatch):
+    # Undo the module-wide fakeredis patch so this test talks to the configured server
+    monkeypatch.setattr(redis_module, "Redis", Redis)
+    store = RedisStore(store_id="luadelete", url=os.environ["DIFFSYNC_TEST_REDIS_URL"])
+    backend = BackendA(internal_storage_engine=store)
+    try:
+        backend.load()
+        # Fail loudly if the server-side path silently falls back to the client-side walk
+        monkeypatch.setattr(
+            store, "_collect_delete_items", lambda *args, **kwargs: pytest.fail("fell back to client-side delete")
+        )
+
+        site = backend.get("site", "nyc")
+        backend.remove(site, remove_children=True)
+
+        with pytest.raises(ObjectNotFound):
+            backend.get("site", "nyc")
+        assert store.count("site") == 2
+        assert store.count("device") == 4
+        assert store.count("interface") == 9
+        assert store.count("person") == 1
+    finally:
+        keys = list(store._store.scan_iter("diffsync:luadelete:*"))  # pylint: disable=protected-access
+        if keys:
+            store._store.delete(*keys)  # pylint: disable=protected-access
+
+
+def test_redis_store_remove_children_recovers_from_script_error(monkeypatch):
+    store = RedisStore(store_id="scripterr", host="localhost")
+    site = Site(name="nyc", devices=["device1"])
+    store.add(site)
+    store.add(Device(name="device1", role="spine"))
+
+    # The delete-tree script validates the whole subtree before deleting anything, so an abort
+    # (e.g. on a blob it can't parse) leaves the store untouched and the fallback walk must
+    # remove the full tree without raising a spurious ObjectNotFound
+    def aborted_script(*_args, **_kwargs):
+        raise ResponseError("blob format not supported by server-side delete")
+
+    monkeypatch.setattr(store, "_delete_tree_script", aborted_script)
+    store.remove(site, remove_children=True)
+    assert store.count() == 0
+
+
+class Loop(DiffSyncModel):
+    """Model type whose children are other Loop objects, permitting cyclic references."""
+
+    _modelname = "loop"
+    _identifiers = ("name",)
+    _children = {"loop": "loops"}
+
+    name: str
+    loops: List = []
+
+
+def test_redis_store_remove_with_cyclic_children_terminates():
+    store = RedisStore(store_id="cycle", host="localhost")
+    parent = Loop(name="a", loops=["b"])
+    store.add(parent)
+    store.add(Loop(name="b", loops=["a"]))
+
+    store.remove(parent, remove_children=True)
+    assert store.count() == 0
+
+
+def test_redis_store_deduplicates_unchanged_writes():
+    store = RedisStore(store_id="dedupe", host="localhost")
+    site = Site(name="nyc")
+    store.add(site)
+    object_key = ("site", "nyc")
+    assert object_key in store._digest_cache  # pylint: disable=protected-access
+
+    # Re-adding or re-updating identical data must not raise and must leave the object intact
+    store.add(Site(name="nyc"))
+    store.update(Site(name="nyc"))
+    assert store.get(Site, "nyc").name == "nyc"
+
+    # Removal drops the fingerprint, so a later update cannot wrongly skip the write
+    store.remove(site)
+    assert object_key not in store._digest_cache  # pylint: disable=protected-access
+
+
+def test_redis_store_compresses_large_blobs():
+    store = RedisStore(store_id="compress", host="localhost")
+    site = Site(name="nyc", devices=[f"device{num}" for num in range(2000)])
+    store.add(site)
+
+    blob = store._store.hget(b"diffsync:compress:site", "nyc")  # pylint: disable=protected-access
+    assert blob[:1] == redis_module.FORMAT_LZ4
+    # The uncompressed serialization is above the threshold, and compression actually saved space
+    uncompressed = lz4.frame.decompress(blob[1:])
+    assert len(uncompressed) > COMPRESSION_MIN_SIZE
+    assert len(blob) < len(uncompressed)
+
+    loaded = store.get(Site, "nyc")
+    assert loaded.devices == site.devices
+
+
+def test_redis_store_model_registry_on_empty_adapter():
+    backend = BackendA(internal_storage_engine=RedisStore(store_id="emptyreg", host="localhost"))
+
+    # Model classes must resolve even while the adapter holds no objects (DiffSync.__len__ makes
+    # an empty adapter falsy), so a dict identifier converts to a uid instead of raising ValueError
+    with pytest.raises(ObjectNotFound):
+        backend.get("site", {"name": "nyc"})
+
+    # ... and the very first object written must already be stored as msgpack, not pickle
+    backend.add(backend.site(name="nyc"))
+    blob = backend.store._store.hget(b"diffsync:emptyreg:site", "nyc")  # pylint: disable=protected-access
+    assert blob[:1] == redis_module.FORMAT_MSGPACK
+
+
+def test_redis_store_with_instance_attribute_model_class():
+    class InstanceAttrAdapter(DiffSync):
+        """Adapter that registers its model class as an instance attribute rather than a class attribute."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.site = Site
+
+    adapter = InstanceAttrAdapter(internal_storage_engine=RedisStore(host="localhost"))
+    adapter.add(adapter.site(name="nyc"))
+
+    # The model class must be resolvable on read, including from a str modelname + dict identifier
+    loaded = adapter.get("site", {"name": "nyc"})
+    assert type(loaded) is Site  # pylint: disable=unidiomatic-typecheck
+    assert loaded.name == "nyc"
+
+
+def test_redis_store_serialization_roundtrip():
+    backend = BackendA(internal_storage_engine=RedisStore(host="localhost"))
+    # SiteA is registered on the adapter (as "site"), so it is stored as msgpack of its dict
+    site = backend.site(name="nyc", devices=["device1"])
+    backend.add(site)
+    loaded_site = backend.get("site", "nyc")
+    assert type(loaded_site) is type(site)  # pylint: disable=unidiomatic-typecheck
+    assert loaded_site.dict() == site.dict()
+    assert loaded_site.diffsync is backend
+
+    # PlaceB is not registered on BackendA, so it falls back to pickle, and still round-trips
+    place = PlaceB(name="Statue of Liberty")
+    backend.add(place)
+    loaded_place = backend.get("place", "Statue of Liberty")
+    assert type(loaded_place) is type(place)  # pylint: disable=unidiomatic-typecheck
+    assert loaded_place.dict() == place.dict()
+
+
+def test_diffsync_sync_with_redis_store_backends():
+    backend_a = BackendA(internal_storage_engine=RedisStore(host="localhost"))
+    backend_a.load()
+    backend_b = BackendB(internal_storage_engine=RedisStore(host="localhost"))
+    backend_b.load()
+
+    assert backend_a.store.diffsync is backend_a
+    assert len(backend_a) == 23
+    # Children registered via add_child() after add() must be written back through the store;
+    # the stored copy of the parent would otherwise never see the in-place mutation
+    assert backend_a.get("site", "nyc").devices == ["nyc-spine1", "nyc-spine2"]
+
+    # The Redis-backed diff must match a LocalStore reference run of the same backends
+    local_a = BackendA()
+    local_a.load()
+    local_b = BackendB()
+    local_b.load()
+    diff = backend_b.diff_from(backend_a)
+    assert diff.has_diffs()
+    assert diff.summary() == local_b.diff_from(local_a).summary()
+
+    # Syncing into a fresh Redis-backed adapter must reproduce the source exactly
+    target = BackendA(internal_storage_engine=RedisStore(host="localhost"))
+    target.sync_from(backend_a)
+    assert target.diff_from(backend_a).has_diffs() is False